@@ -3,7 +3,6 @@ from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
-from models import OperationResult
 from services import FileAnalysisService, FileOrganizationService
 
 
@@ -28,32 +27,8 @@ def analyze_folder(folder_path: str) -> dict[str, Any]:
     """
     result = analysis_service.analyze_folder(folder_path)
 
-    response = {
-        "success": True,
-        "source_folder": str(result.source_folder),
-        "total_files": result.total_files,
-        "categories": [
-            {
-                "name": org.category,
-                "suggested_folder": org.suggested_folder_name,
-                "file_count": len(org.files),
-                "files": [
-                    {
-                        "original_name": f.original_name,
-                        "suggested_name": f.suggested_name,
-                        "size": f.file_size,
-                        "type": f.file_type,
-                        "confidence": f.confidence_score,
-                        "tags": f.tags,
-                    }
-                    for f in org.files[:10]  # Top 10 files per category
-                ],
-            }
-            for org in result.organized_folders
-        ],
-        "uncategorized_count": len(result.unorganized_files),
-        "suggested_structure": result.suggested_structure,
-    }
+    # Top 10 files per category
+    response = {"success": True, **result.to_dict(limit_per_category=10)}
 
     return response
 
@@ -85,6 +60,10 @@ def organize_files(
         analysis_result, create_folders=create_folders, move_files=move_files
     )
 
+    # Folder contents changed; cached analysis for it is now stale
+    if create_folders or move_files:
+        analysis_service.invalidate(folder_path)
+
     response = {
         "success": True,
         "action": "analyze" if not create_folders else "organize",
@@ -1,9 +1,9 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata about a file."""
     original_name: str
@@ -17,7 +17,7 @@ class FileMetadata:
     tags: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class FolderOrganization:
     """Represents organized files by category."""
     category: str
@@ -25,7 +25,7 @@ class FolderOrganization:
     suggested_folder_name: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class OrganizationResult:
     """Result of file organization operation."""
     source_folder: Path
@@ -33,3 +33,36 @@ class OrganizationResult:
     organized_folders: List[FolderOrganization] = field(default_factory=list)
     unorganized_files: List[FileMetadata] = field(default_factory=list)
     suggested_structure: dict = field(default_factory=dict)
+
+    def to_dict(self, limit_per_category: int = 10) -> dict:
+        """Build the JSON-serializable response payload in one pass.
+
+        Only the first ``limit_per_category`` files of each category are
+        expanded into per-file dicts, so large folders don't materialize
+        an entry for every file just to throw most of them away.
+        """
+        return {
+            "source_folder": str(self.source_folder),
+            "total_files": self.total_files,
+            "categories": [
+                {
+                    "name": org.category,
+                    "suggested_folder": org.suggested_folder_name,
+                    "file_count": len(org.files),
+                    "files": [
+                        {
+                            "original_name": f.original_name,
+                            "suggested_name": f.suggested_name,
+                            "size": f.file_size,
+                            "type": f.file_type,
+                            "confidence": f.confidence_score,
+                            "tags": f.tags,
+                        }
+                        for f in org.files[:limit_per_category]
+                    ],
+                }
+                for org in self.organized_folders
+            ],
+            "uncategorized_count": len(self.unorganized_files),
+            "suggested_structure": self.suggested_structure,
+        }
@@ -1,14 +1,30 @@
 """File analysis service for organizing files by topic."""
+import atexit
+import hashlib
+import operator
 import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Optional
 import json
 import httpx
 
 from models import FileMetadata, FolderOrganization, OrganizationResult
+from settings import (
+    CATEGORY_KEYWORDS,
+    MAX_ANALYSIS_WORKERS,
+    MAX_FILE_SIZE_MB,
+    MAX_FILES_TO_ANALYZE,
+    TEXT_FILE_EXTENSIONS,
+)
 from utils import (
     validate_path,
-    is_text_file,
     sanitize_folder_name,
     AnalysisError,
     FileAccessError,
@@ -16,13 +32,197 @@ from utils import (
 from utils.interactive import prompt_for_classification, prompt_for_subcategory
 
 
+# Keyword matching table built once at import time. All keywords are matched
+# in a single pass of the compiled regex instead of one substring check per
+# keyword, so classifying a file costs one linear scan of the text regardless
+# of how many keywords are configured. Longer keywords are tried first so the
+# most specific match wins; duplicates across categories resolve to the first
+# category listed in CATEGORY_KEYWORDS.
+_KEYWORD_TO_CATEGORY: Dict[str, str] = {}
+for _category, _keywords in CATEGORY_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KEYWORD_TO_CATEGORY.setdefault(_keyword.lower(), _category)
+
+
+def _compile_keyword_pattern() -> "re.Pattern[str]":
+    """Compile one alternation with a named group per category.
+
+    Each match reports its category directly via ``match.lastgroup``, so the
+    scan loop needs no per-match dict lookup. Keywords are ordered longest
+    first within each group so the most specific alternative wins.
+    """
+    groups = []
+    for category in CATEGORY_KEYWORDS:
+        keywords = sorted(
+            (kw for kw, cat in _KEYWORD_TO_CATEGORY.items() if cat == category),
+            key=len,
+            reverse=True,
+        )
+        if keywords:
+            groups.append(f"(?P<{category}>{'|'.join(re.escape(kw) for kw in keywords)})")
+    return re.compile("|".join(groups))
+
+
+_KEYWORD_RE = _compile_keyword_pattern()
+
+# Content previews are tokenized once into a word set and scored with
+# per-category frozenset intersections: one O(length) tokenization plus
+# hash-based lookups, and whole-word matching avoids the partial-word
+# false positives of substring scans (e.g. "java" inside "javascript").
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Translation table for stripping trailing punctuation off tag words;
+# one C-level translate per word instead of a Python strip call.
+_TAG_PUNCT = str.maketrans("", "", ".,;:")
+
+_KEYWORD_SETS: Dict[str, frozenset] = {
+    category: frozenset(kw.lower() for kw in keywords)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+# Extensions whose category is unambiguous. Resolving these with one dict
+# lookup avoids iterating the keyword table (and scanning content) for the
+# vast majority of files. Ambiguous extensions (.txt, .json, .xml, ...)
+# are deliberately absent and fall through to keyword matching.
+_EXT_TO_CATEGORY: Dict[str, str] = {
+    ".pdf": "Documents", ".doc": "Documents", ".docx": "Documents",
+    ".rtf": "Documents", ".odt": "Documents",
+    ".jpg": "Images", ".jpeg": "Images", ".png": "Images", ".gif": "Images",
+    ".bmp": "Images", ".svg": "Images", ".ico": "Images", ".webp": "Images",
+    ".mp4": "Videos", ".avi": "Videos", ".mkv": "Videos", ".mov": "Videos",
+    ".wmv": "Videos", ".webm": "Videos",
+    ".mp3": "Audio", ".wav": "Audio", ".flac": "Audio", ".ogg": "Audio",
+    ".m4a": "Audio",
+    ".py": "Code", ".js": "Code", ".ts": "Code", ".java": "Code",
+    ".cpp": "Code", ".c": "Code", ".h": "Code", ".go": "Code", ".rs": "Code",
+    ".rb": "Code", ".php": "Code", ".sh": "Code", ".bash": "Code",
+    ".scala": "Code", ".vue": "Code", ".jsx": "Code", ".tsx": "Code",
+    ".csv": "Data", ".sql": "Data", ".xlsx": "Data", ".xls": "Data",
+    ".parquet": "Data", ".db": "Data", ".sqlite": "Data",
+    ".ini": "Configuration", ".conf": "Configuration",
+    ".config": "Configuration", ".toml": "Configuration",
+    ".yaml": "Configuration", ".yml": "Configuration",
+    ".properties": "Configuration", ".env": "Configuration",
+}
+
+# Subcategory detection tables. Extensions that pin down a language map
+# directly; otherwise one combined-regex pass over filename and content
+# replaces a chain of per-keyword substring checks, with the matching
+# named group naming the subcategory.
+_EXT_TO_SUBCATEGORY: Dict[str, str] = {
+    ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
+    ".java": "Java", ".sql": "SQL", ".sh": "Shell", ".bash": "Shell",
+    ".rb": "Ruby", ".php": "PHP", ".go": "Go", ".rs": "Rust",
+    ".cpp": "Cpp", ".scala": "Scala", ".vue": "Vue",
+    ".jsx": "React", ".tsx": "React",
+}
+
+_SUBCATEGORY_RE = re.compile(
+    "|".join(
+        (
+            r"(?P<Flask>\bflask\b)",
+            r"(?P<Django>\bdjango\b)",
+            r"(?P<Spring>\bspringframework\b|\bspring boot\b)",
+            r"(?P<PostgreSQL>\bpostgres\w*\b|\bpsycopg\w*\b)",
+            r"(?P<Python>\bpython\b|\bdef \w+\(|\bimport \w+)",
+            r"(?P<SQL>\bselect .+ from\b|\binsert into\b|\bcreate table\b)",
+            r"(?P<JavaScript>\bjavascript\b|\bnode\.?js\b)",
+        )
+    )
+)
+
+# Extensions where the content preview can change the classification or
+# naming outcome. Everything else skips the open/read entirely — the
+# extension (or filename) already tells us what the file is.
+_CONTENT_SCAN_EXTENSIONS = frozenset(
+    {"", ".txt", ".md", ".log", ".json", ".yaml", ".yml", ".xml", ".html"}
+)
+
+# Previews are only read for known-text extensions under the size limit;
+# both checks are precomputed so the per-file gate is two C-level
+# comparisons instead of a call into utils.is_text_file (which would
+# also re-stat the file).
+_PREVIEW_EXTENSIONS: frozenset = _CONTENT_SCAN_EXTENSIONS & frozenset(
+    TEXT_FILE_EXTENSIONS
+)
+_MAX_PREVIEW_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
+
+# Model used for OpenAI chat-completion classification.
+_OPENAI_MODEL = "gpt-4o-mini"
+
+# Kept short on purpose: prompt tokens dominate the cost and latency of
+# these tiny classification calls, and JSON mode (response_format) makes
+# the model emit valid JSON without spelling out formatting rules.
+_OPENAI_SYSTEM_PROMPT = (
+    "Classify the file. Return JSON: category(str), confidence(0-1), "
+    "subcategory(str|null), suggested_name(str|null)."
+)
+
+# LLM answers are deterministic for identical inputs, so they persist
+# across runs in a small sqlite file under the user cache directory.
+_LLM_DISK_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "mcp_folder_organizer"
+    / "llm_cache.db"
+)
+
+# Upper bound on per-file analysis results kept in memory (LRU eviction).
+_ANALYSIS_CACHE_MAX_ENTRIES = 50_000
+
+# Whole-folder results are reused briefly so the MCP tool pattern of
+# calling analyze_folder / organize_files / get_structure back-to-back
+# on the same folder runs the full analysis once, not three times.
+_FOLDER_CACHE_TTL_SECONDS = 60.0
+_FOLDER_CACHE_MAX_ENTRIES = 64
+
+
 class FileAnalysisService:
     """Service for analyzing files and suggesting organization."""
 
     def __init__(self):
         """Initialize the analysis service."""
-        self.analysis_cache: Dict[str, FileMetadata] = {}
-        self.llm_cache: Dict[str, tuple] = {}  # Cache LLM responses by file hash
+        # LRU of per-file results keyed by (path, mtime_ns, size), so
+        # repeated analyze_folder calls skip re-reading unchanged files.
+        self.analysis_cache: "OrderedDict[tuple, FileMetadata]" = OrderedDict()
+        # Short-TTL cache of whole-folder results keyed by
+        # (path, directory mtime_ns); values are (deadline, result).
+        self._folder_cache: "OrderedDict[tuple, tuple[float, OrganizationResult]]" = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+        # LLM responses keyed by (filename, file_type, preview prefix)
+        self.llm_cache: Dict[tuple, tuple] = {}
+        # Classification shared across files whose type and content
+        # preview are identical (boilerplate configs, rotated logs with
+        # the same header, ...), keyed by (file_type, preview hash).
+        # Only (category, confidence, subcategory) propagates between
+        # files; suggested_name stays per-filename.
+        self._llm_content_cache: Dict[tuple, tuple] = {}
+        self.dedup_hits = 0
+        # On-disk LLM cache (opened lazily; disabled on first failure)
+        self._disk_cache: Optional[sqlite3.Connection] = None
+        self._disk_cache_failed = False
+        self._disk_cache_lock = threading.Lock()
+        # One keep-alive connection pool for all LLM calls; opening a
+        # fresh TCP/TLS connection (and DNS lookup) per classified file
+        # dominates latency when analyzing hundreds of files.
+        # Pool sized to the analysis worker count so every in-flight
+        # classification keeps a warm connection instead of queueing.
+        # The transport retries failed connection attempts; status-level
+        # retries (429/5xx) are handled in _post_with_retry.
+        self._http = httpx.Client(
+            transport=httpx.HTTPTransport(retries=3),
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=MAX_ANALYSIS_WORKERS,
+                max_keepalive_connections=MAX_ANALYSIS_WORKERS,
+            ),
+        )
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Release the shared HTTP connection pool."""
+        self._http.close()
 
     def analyze_folder(self, folder_path: str) -> OrganizationResult:
         """
@@ -36,6 +236,12 @@ class FileAnalysisService:
         """
         path = validate_path(folder_path)
 
+        folder_key = (str(path), os.stat(path).st_mtime_ns)
+        with self._cache_lock:
+            cached = self._folder_cache.get(folder_key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
         try:
             files = self._get_all_files(path)
 
@@ -47,20 +253,25 @@ class FileAnalysisService:
                     unorganized_files=[],
                 )
 
-            # Analyze each file
-            analyzed_files = []
-            for file_path in files:
-                try:
-                    metadata = self._analyze_file(file_path, path)
-                    analyzed_files.append(metadata)
-                except AnalysisError:
-                    # Skip files that can't be analyzed
-                    continue
+            # Analyze files concurrently; _analyze_file is I/O bound
+            # (stat/read syscalls, optional LLM calls) so threads overlap
+            # that latency. Results are re-sorted by name for determinism.
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_ANALYSIS_WORKERS, len(files))
+            ) as executor:
+                analyzed_files = [
+                    metadata
+                    for metadata in executor.map(
+                        lambda entry: self._safe_analyze(entry, path), files
+                    )
+                    if metadata is not None
+                ]
+            analyzed_files.sort(key=operator.attrgetter("original_name"))
 
             # Organize by category
             organized_folders = self._organize_by_category(analyzed_files)
 
-            return OrganizationResult(
+            result = OrganizationResult(
                 source_folder=path,
                 total_files=len(analyzed_files),
                 organized_folders=organized_folders,
@@ -70,32 +281,120 @@ class FileAnalysisService:
                 suggested_structure=self._build_structure(organized_folders),
             )
 
+            with self._cache_lock:
+                self._folder_cache[folder_key] = (
+                    time.monotonic() + _FOLDER_CACHE_TTL_SECONDS,
+                    result,
+                )
+                while len(self._folder_cache) > _FOLDER_CACHE_MAX_ENTRIES:
+                    self._folder_cache.popitem(last=False)
+
+            return result
+
         except Exception as e:
             raise AnalysisError(f"Failed to analyze folder: {str(e)}")
 
-    def _get_all_files(self, folder_path: Path) -> List[Path]:
-        """Get all files in folder (non-recursively by default)."""
+    def invalidate(self, folder_path: str) -> None:
+        """Drop cached folder results after the folder has been mutated."""
+        path_str = str(Path(folder_path))
+        with self._cache_lock:
+            for key in [k for k in self._folder_cache if k[0] == path_str]:
+                del self._folder_cache[key]
+
+    def _get_all_files(self, folder_path: Path) -> List[os.DirEntry]:
+        """Get all files in folder (non-recursively by default).
+
+        Returns DirEntry objects: the directory scan already carries file
+        type (and often stat) information, so callers avoid issuing an
+        extra stat() syscall per file. The scan is consumed as a stream
+        and cut off at MAX_FILES_TO_ANALYZE, so a pathologically large
+        directory never materializes more entries than we will analyze.
+        """
         try:
-            files = [f for f in folder_path.iterdir() if f.is_file()]
-            return sorted(files, key=lambda x: x.name)
+            with os.scandir(folder_path) as it:
+                files = list(
+                    islice(
+                        (e for e in it if e.is_file(follow_symlinks=False)),
+                        MAX_FILES_TO_ANALYZE,
+                    )
+                )
+            files.sort(key=operator.attrgetter("name"))
+            return files
         except (OSError, PermissionError) as e:
             raise FileAccessError(f"Cannot access folder: {str(e)}")
 
-    def _analyze_file(self, file_path: Path, base_path: Path) -> FileMetadata:
-        """Analyze a single file."""
+    def _safe_analyze(self, entry: os.DirEntry, base_path: Path) -> Optional[FileMetadata]:
+        """Analyze one file, returning None for files that can't be analyzed."""
         try:
-            file_name = file_path.name
-            file_size = file_path.stat().st_size
-            file_type = file_path.suffix.lower()
+            return self._analyze_file(entry, base_path)
+        except AnalysisError:
+            return None
 
-            # Read content preview for text files
+    def _analyze_file(self, entry: os.DirEntry, base_path: Path) -> FileMetadata:
+        """Analyze a single file given its directory entry."""
+        try:
+            file_name = entry.name
+            stat_result = entry.stat()
+            file_size = stat_result.st_size
+
+            cache_key = (entry.path, stat_result.st_mtime_ns, file_size)
+            with self._cache_lock:
+                cached = self.analysis_cache.get(cache_key)
+                if cached is not None:
+                    self.analysis_cache.move_to_end(cache_key)
+            if cached is not None:
+                return cached
+
+            # Equivalent to Path(file_name).stem/.suffix without building
+            # a Path; split once here and thread the parts through the
+            # naming and tag helpers instead of re-splitting per helper.
+            head, sep, tail = file_name.rpartition(".")
+            if head and tail:
+                file_stem = head
+                file_suffix = f".{tail}"
+                file_type = file_suffix.lower()
+            else:
+                file_stem = file_name
+                file_suffix = ""
+                file_type = ""
+            file_path = Path(entry.path)
+
+            # Zero-byte files and files over MAX_FILE_SIZE_MB carry no
+            # classifiable preview, so the name and extension are the
+            # only real signal; settle them here rather than spending an
+            # LLM round trip on an empty content field.
+            if file_size == 0 or file_size > _MAX_PREVIEW_FILE_SIZE:
+                ext_category = _EXT_TO_CATEGORY.get(file_type)
+                if ext_category is not None:
+                    category, confidence = ext_category, 0.9
+                else:
+                    category, confidence = self._keyword_suggest_category(file_name, "")
+                metadata = FileMetadata(
+                    original_name=file_name,
+                    suggested_name=self._heuristic_filename(
+                        file_stem, file_suffix, category
+                    ),
+                    file_path=file_path,
+                    file_size=file_size,
+                    file_type=file_type,
+                    suggested_category=category,
+                    confidence_score=confidence,
+                    content_preview="",
+                    tags=self._extract_tags(file_stem, ""),
+                )
+                with self._cache_lock:
+                    self.analysis_cache[cache_key] = metadata
+                    if len(self.analysis_cache) > _ANALYSIS_CACHE_MAX_ENTRIES:
+                        self.analysis_cache.popitem(last=False)
+                return metadata
+
+            # Read content preview only when it can affect the outcome;
+            # files with an unambiguous extension skip the open/read.
             content_preview = ""
-            if is_text_file(file_path):
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content_preview = f.read(500)
-                except Exception:
-                    pass
+            if file_type == "" or file_type in _PREVIEW_EXTENSIONS:
+                # Extensionless files rely on the reader's magic-byte
+                # check to weed out binaries instead of an extension.
+                content_preview = self._read_preview(entry.path)
 
             # Analyze and suggest category
             category, confidence = self._suggest_category(
@@ -103,11 +402,13 @@ class FileAnalysisService:
             )
 
             # Suggest improved name
-            suggested_name = self._suggest_filename(file_name, category, file_type, content_preview)
+            suggested_name = self._suggest_filename(
+                file_name, file_stem, file_suffix, category, file_type, content_preview
+            )
 
-            tags = self._extract_tags(file_name, content_preview)
+            tags = self._extract_tags(file_stem, content_preview)
 
-            return FileMetadata(
+            metadata = FileMetadata(
                 original_name=file_name,
                 suggested_name=suggested_name,
                 file_path=file_path,
@@ -119,49 +420,265 @@ class FileAnalysisService:
                 tags=tags,
             )
 
+            with self._cache_lock:
+                self.analysis_cache[cache_key] = metadata
+                if len(self.analysis_cache) > _ANALYSIS_CACHE_MAX_ENTRIES:
+                    self.analysis_cache.popitem(last=False)
+
+            return metadata
+
         except Exception as e:
-            raise AnalysisError(f"Failed to analyze file {file_path}: {str(e)}")
+            raise AnalysisError(f"Failed to analyze file {entry.path}: {str(e)}")
+
+    @staticmethod
+    def _read_preview(path: str, size: int = 500) -> str:
+        """Read the first ``size`` bytes of a file as lenient UTF-8.
+
+        Uses a raw fd read instead of open(): grabbing 500 bytes does not
+        need the BufferedReader's 8 KiB buffer or a TextIOWrapper with an
+        incremental decoder per file.
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                raw = os.read(fd, size)
+            finally:
+                os.close(fd)
+        except OSError:
+            return ""
+
+        # Magic-byte sanity check: a NUL in the first bytes means binary
+        # content regardless of what the extension claimed, so don't feed
+        # garbage into keyword matching or LLM prompts.
+        if b"\x00" in raw:
+            return ""
+
+        return raw.decode("utf-8", errors="ignore")
 
     def _suggest_category(
         self, filename: str, file_type: str, content: str
     ) -> tuple[str, float]:
-        """Suggest category and confidence score using AI when available.
+        """Suggest category and confidence score.
 
-        Delegates to external LLM or OpenAI for classification.
-        If no AI is configured, returns "Uncategorized" with 0.0 confidence.
+        An unambiguous extension settles the category with one dict
+        lookup before any LLM round trip — a .py file is Code no matter
+        what a model would say about it. Only ambiguous files are sent
+        to the external LLM / OpenAI, and when no AI is configured they
+        fall back to the single-pass keyword scan.
         """
+        # Unambiguous extension: decided without spending an LLM call.
+        ext_category = _EXT_TO_CATEGORY.get(file_type)
+        if ext_category is not None:
+            return ext_category, 0.9
+
         ai_category, ai_conf = self._ai_suggest_category(filename, file_type, content)
-        return ai_category, ai_conf
+        if ai_category != "Uncategorized":
+            return ai_category, ai_conf
 
-    def _ai_suggest_category(self, filename: str, file_type: str, content: str) -> tuple[str, float]:
-        """AI-based category classification using external LLM or OpenAI.
+        return self._keyword_suggest_category(filename, content)
 
-        Returns (category, confidence). 
-        Falls back to interactive prompt only if INTERACTIVE_MODE=true.
-        Otherwise returns ("Uncategorized", 0.0).
+    def _keyword_suggest_category(self, filename: str, content: str) -> tuple[str, float]:
+        """Classify by scanning filename and content against CATEGORY_KEYWORDS.
+
+        The filename is scanned once with the precompiled keyword regex
+        (substring hits matter there), while the content preview is
+        tokenized into a word set and scored with per-category set
+        intersections. The category with the most hits wins. Returns
+        ("Uncategorized", 0.0) when nothing matches.
+        """
+        counts: Counter = Counter()
+        for match in _KEYWORD_RE.finditer(filename.lower()):
+            counts[match.lastgroup] += 2  # filename hits weigh more
+        if content:
+            tokens = frozenset(_WORD_RE.findall(content.lower()))
+            for category, keywords in _KEYWORD_SETS.items():
+                hits = len(keywords & tokens)
+                if hits:
+                    counts[category] += hits
+
+        if not counts:
+            return "Uncategorized", 0.0
+
+        category, score = counts.most_common(1)[0]
+        confidence = min(0.9, 0.4 + 0.1 * score)
+        return category, confidence
+
+    def _llm_classify_once(
+        self, filename: str, file_type: str, content: str
+    ) -> Optional[tuple[str, float, Optional[str], Optional[str]]]:
+        """Run at most one LLM round trip per file and share the answer.
+
+        The response already carries category, confidence, subcategory and
+        suggested_name, so the category / filename / subcategory helpers
+        all read from one cached (category, confidence, subcategory,
+        suggested_name) tuple instead of each issuing their own request.
+        Keyed by (filename, file_type, preview prefix) so lookups with the
+        stored 200-char preview hit the same entry. Returns None when no
+        LLM backend is configured or the call fails.
         """
-        # Try external LLM first
+        external_url = os.environ.get("EXTERNAL_LLM_URL")
+        openai_key = os.environ.get("OPENAI_API_KEY")
+        if not external_url and not openai_key:
+            return None
+
+        # Truncate the preview once here; the backend helpers use it as-is
+        content = (content or "")[:1000]
+        key = (filename, file_type, content[:200])
+        content_key = (
+            (file_type, hashlib.sha1(content[:500].encode()).hexdigest())
+            if content
+            else None
+        )
+        with self._cache_lock:
+            if key in self.llm_cache:
+                return self.llm_cache[key]
+            # Another file with the same type and content already got an
+            # answer; reuse its category/subcategory instead of spending
+            # a second round trip. suggested_name is filename-specific,
+            # so it falls back to the heuristic for this file.
+            if content_key is not None and content_key in self._llm_content_cache:
+                self.dedup_hits += 1
+                category, confidence, subcategory = self._llm_content_cache[content_key]
+                result = (category, confidence, subcategory, None)
+                self.llm_cache[key] = result
+                return result
+
+        # Classification is deterministic (temperature=0), so answers for
+        # unchanged inputs can be replayed across process restarts.
+        backend = external_url or f"openai/{_OPENAI_MODEL}"
+        disk_key = hashlib.sha256(
+            json.dumps(
+                {"f": filename, "t": file_type, "c": key[2], "m": backend},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+        result = self._disk_cache_get(disk_key)
+
+        if result is None:
+            try:
+                if external_url:
+                    result = self._external_llm_classify(
+                        external_url,
+                        os.environ.get("EXTERNAL_LLM_API_KEY"),
+                        filename,
+                        file_type,
+                        content,
+                    )
+                if result is None and openai_key:
+                    result = self._openai_classify(openai_key, filename, file_type, content)
+            except Exception:
+                result = None
+            if result is not None:
+                self._disk_cache_put(disk_key, result)
+
+        if result is not None:
+            with self._cache_lock:
+                self.llm_cache[key] = result
+                if content_key is not None:
+                    self._llm_content_cache[content_key] = result[:3]
+        return result
+
+    def _get_disk_cache(self) -> Optional["sqlite3.Connection"]:
+        """Open (once) the on-disk LLM response cache, or None on failure."""
+        with self._disk_cache_lock:
+            if self._disk_cache_failed:
+                return None
+            if self._disk_cache is None:
+                try:
+                    _LLM_DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(
+                        _LLM_DISK_CACHE_PATH, check_same_thread=False
+                    )
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_cache ("
+                        "key TEXT PRIMARY KEY, value TEXT, created_at REAL)"
+                    )
+                    conn.commit()
+                    self._disk_cache = conn
+                except Exception:
+                    # Cache is an optimization; never fail analysis over it
+                    self._disk_cache_failed = True
+                    return None
+            return self._disk_cache
+
+    def _disk_cache_get(
+        self, disk_key: str
+    ) -> Optional[tuple[str, float, Optional[str], Optional[str]]]:
+        """Look up a persisted LLM response by its content hash."""
+        conn = self._get_disk_cache()
+        if conn is None:
+            return None
         try:
-            external_url = os.environ.get("EXTERNAL_LLM_URL")
-            external_key = os.environ.get("EXTERNAL_LLM_API_KEY")
-            if external_url:
-                external_result = self._external_llm_classify(
-                    external_url, external_key, filename, file_type, content
-                )
-                if external_result:
-                    cat, conf, subcat, _ = external_result
-                    return (cat, conf)
+            with self._disk_cache_lock:
+                row = conn.execute(
+                    "SELECT value FROM llm_cache WHERE key = ?", (disk_key,)
+                ).fetchone()
+            if row:
+                category, confidence, subcategory, suggested_name = json.loads(row[0])
+                return category, confidence, subcategory, suggested_name
+        except Exception:
+            pass
+        return None
 
-            # Try OpenAI if no external URL
-            openai_key = os.environ.get("OPENAI_API_KEY")
-            if openai_key:
-                openai_result = self._openai_classify(openai_key, filename, file_type, content)
-                if openai_result:
-                    cat, conf, subcat, _ = openai_result
-                    return (cat, conf)
+    def _disk_cache_put(self, disk_key: str, result: tuple) -> None:
+        """Persist an LLM response under its content hash."""
+        conn = self._get_disk_cache()
+        if conn is None:
+            return
+        try:
+            with self._disk_cache_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (disk_key, json.dumps(list(result), separators=(",", ":")), time.time()),
+                )
+                conn.commit()
         except Exception:
             pass
 
+    def _post_with_retry(
+        self,
+        url: str,
+        content: bytes,
+        headers: Dict[str, str],
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        attempts: int = 3,
+    ) -> httpx.Response:
+        """POST with backoff on 429/5xx responses.
+
+        Rate-limited and transiently failing calls honor the server's
+        Retry-After header when present, otherwise back off
+        exponentially. The last response is returned either way so the
+        caller's raise_for_status() reports the real failure.
+        """
+        for attempt in range(attempts):
+            response = self._http.post(
+                url, content=content, headers=headers, timeout=timeout
+            )
+            if (
+                response.status_code != 429 and response.status_code < 500
+            ) or attempt + 1 == attempts:
+                return response
+            try:
+                delay = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                delay = float(2 ** attempt)
+            time.sleep(min(delay, 30.0))
+        return response
+
+    def _ai_suggest_category(self, filename: str, file_type: str, content: str) -> tuple[str, float]:
+        """AI-based category classification using external LLM or OpenAI.
+
+        Returns (category, confidence).
+        Falls back to interactive prompt only if INTERACTIVE_MODE=true.
+        Otherwise returns ("Uncategorized", 0.0).
+        """
+        result = self._llm_classify_once(filename, file_type, content)
+        if result:
+            cat, conf, subcat, _ = result
+            return (cat, conf)
+
         # Fallback to interactive prompt only if explicitly enabled
         if os.environ.get("INTERACTIVE_MODE", "").lower() == "true":
             try:
@@ -189,7 +706,7 @@ class FileAnalysisService:
             "input": {
                 "filename": filename,
                 "file_type": file_type,
-                "content_preview": (content or "")[:1000],
+                "content_preview": content,
             },
             "instructions": (
                 "Classify the file into a category and optional subcategory, and "
@@ -203,23 +720,29 @@ class FileAnalysisService:
             headers["Authorization"] = f"Bearer {api_key}"
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                r = client.post(url, json=payload, headers=headers)
-                r.raise_for_status()
-                # Expect JSON in response body
-                data = r.json()
+            # Encode once with compact separators instead of letting httpx
+            # run json.dumps with its default (space-padded) formatting.
+            r = self._post_with_retry(
+                url,
+                content=json.dumps(payload, separators=(",", ":")).encode(),
+                headers=headers,
+                timeout=10.0,
+            )
+            r.raise_for_status()
+            # Expect JSON in response body
+            data = r.json()
 
-                # Accept either top-level or under `result` key
-                if "result" in data and isinstance(data["result"], dict):
-                    data = data["result"]
+            # Accept either top-level or under `result` key
+            if "result" in data and isinstance(data["result"], dict):
+                data = data["result"]
 
-                category = data.get("category") or data.get("label")
-                confidence = float(data.get("confidence", 0.0)) if data.get("confidence") is not None else 0.0
-                subcategory = data.get("subcategory")
-                suggested_name = data.get("suggested_name")
+            category = data.get("category") or data.get("label")
+            confidence = float(data.get("confidence", 0.0)) if data.get("confidence") is not None else 0.0
+            subcategory = data.get("subcategory")
+            suggested_name = data.get("suggested_name")
 
-                if category:
-                    return category, confidence, subcategory, suggested_name
+            if category:
+                return category, confidence, subcategory, suggested_name
 
         except Exception:
             return None
@@ -232,24 +755,20 @@ class FileAnalysisService:
         Returns (category, confidence, subcategory, suggested_name) or None on failure.
         """
         try:
-            prompt = (
-                "You are a file classifier. Given filename, file_type and a short content_preview, "
-                "return a JSON object with keys: category(str), confidence(float 0-1), optional subcategory(str), "
-                "optional suggested_name(str). Only output valid JSON. Example: {\"category\": \"Code\", \"confidence\": 0.9, \"subcategory\": \"Python\"}.\n\n"
-            )
-
             payload = {
-                "model": "gpt-3.5-turbo",
+                "model": _OPENAI_MODEL,
+                "response_format": {"type": "json_object"},
                 "messages": [
-                    {"role": "system", "content": prompt},
+                    {"role": "system", "content": _OPENAI_SYSTEM_PROMPT},
                     {
                         "role": "user",
                         "content": json.dumps(
                             {
                                 "filename": filename,
                                 "file_type": file_type,
-                                "content_preview": (content or "")[:1000],
-                            }
+                                "content_preview": content,
+                            },
+                            separators=(",", ":"),
                         ),
                     },
                 ],
@@ -259,103 +778,124 @@ class FileAnalysisService:
 
             headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
-            with httpx.Client(timeout=15.0) as client:
-                r = client.post("https://api.openai.com/v1/chat/completions", json=payload, headers=headers)
-                r.raise_for_status()
-                data = r.json()
+            r = self._post_with_retry(
+                "https://api.openai.com/v1/chat/completions",
+                content=json.dumps(payload, separators=(",", ":")).encode(),
+                headers=headers,
+            )
+            r.raise_for_status()
+            data = r.json()
 
-                choices = data.get("choices") or []
-                if not choices:
-                    return None
-                content_text = choices[0].get("message", {}).get("content", "")
+            choices = data.get("choices") or []
+            if not choices:
+                return None
+            content_text = choices[0].get("message", {}).get("content", "")
 
+            # JSON mode makes the reply a bare JSON object; the balanced-
+            # brace extraction stays as a fallback for any prose-wrapped
+            # response.
+            try:
+                parsed = json.loads(content_text)
+            except ValueError:
                 json_text = self._extract_json_from_text(content_text)
                 if not json_text:
                     return None
-
                 parsed = json.loads(json_text)
-                category = parsed.get("category") or parsed.get("label")
-                confidence = float(parsed.get("confidence", 0.0)) if parsed.get("confidence") is not None else 0.0
-                subcategory = parsed.get("subcategory")
-                suggested_name = parsed.get("suggested_name")
-                if category:
-                    return category, confidence, subcategory, suggested_name
+            category = parsed.get("category") or parsed.get("label")
+            confidence = float(parsed.get("confidence", 0.0)) if parsed.get("confidence") is not None else 0.0
+            subcategory = parsed.get("subcategory")
+            suggested_name = parsed.get("suggested_name")
+            if category:
+                return category, confidence, subcategory, suggested_name
         except Exception:
             return None
 
         return None
 
-    def _extract_json_from_text(self, text: str) -> Optional[str]:
-        """Find a JSON object substring in free text and return it, or None."""
-        try:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                candidate = text[start : end + 1]
-                json.loads(candidate)
-                return candidate
-        except Exception:
-            return None
+    @staticmethod
+    def _extract_json_from_text(text: str) -> Optional[str]:
+        """Return the first balanced ``{...}`` substring in free text, or None.
+
+        A single brace-counting pass replaces the old find/rfind slice —
+        that grabbed everything between the first '{' and the last '}',
+        which breaks when the model appends prose containing a stray
+        brace, and it ran json.loads once just to validate before the
+        caller parsed the same text again.
+        """
+        depth = 0
+        start = -1
+        for i, ch in enumerate(text):
+            if ch == "{":
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif ch == "}" and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    return text[start : i + 1]
         return None
 
-    def _suggest_filename(self, original_name: str, category: str, file_type: str, content_preview: str) -> str:
+    def _suggest_filename(
+        self,
+        original_name: str,
+        stem: str,
+        suffix: str,
+        category: str,
+        file_type: str,
+        content_preview: str,
+    ) -> str:
         """Suggest an improved filename using AI if available, otherwise heuristics.
 
-        Tries external LLM/OpenAI first to get AI-suggested names.
+        Reuses the per-file LLM classification (one round trip per file).
         Falls back to heuristic-based suggestion if no AI is configured.
         """
-        try:
-            # Try external LLM first
-            external_url = os.environ.get("EXTERNAL_LLM_URL")
-            external_key = os.environ.get("EXTERNAL_LLM_API_KEY")
-            if external_url:
-                result = self._external_llm_classify(
-                    external_url, external_key, original_name, file_type, content_preview
-                )
-                if result and result[3]:  # result[3] is suggested_name
-                    return result[3]
-
-            # Try OpenAI
-            openai_key = os.environ.get("OPENAI_API_KEY")
-            if openai_key:
-                result = self._openai_classify(openai_key, original_name, file_type, content_preview)
-                if result and result[3]:  # result[3] is suggested_name
-                    return result[3]
-        except Exception:
-            pass
+        result = self._llm_classify_once(original_name, file_type, content_preview)
+        if result and result[3]:  # result[3] is suggested_name
+            return result[3]
 
-        # Fallback to heuristic-based naming
-        name_without_ext = Path(original_name).stem
-        ext = Path(original_name).suffix
+        return self._heuristic_filename(stem, suffix, category)
 
+    @staticmethod
+    def _heuristic_filename(stem: str, suffix: str, category: str) -> str:
+        """Heuristic rename used when no AI suggestion is available."""
         # If filename is already descriptive, keep it
-        if len(name_without_ext) > 5 and "_" in name_without_ext:
-            return original_name
+        if len(stem) > 5 and "_" in stem:
+            return f"{stem}{suffix}"
 
         # Otherwise, enhance it with category prefix
-        suggested = f"{category}_{name_without_ext}{ext}"
-        return suggested
+        return f"{category}_{stem}{suffix}"
 
-    def _extract_tags(self, filename: str, content: str) -> List[str]:
-        """Extract relevant tags from filename and content."""
-        tags = []
+    def _extract_tags(self, stem: str, content: str) -> List[str]:
+        """Extract relevant tags from the filename stem and content.
 
-        # Extract from filename
-        parts = Path(filename).stem.split("_")
-        tags.extend([p for p in parts if len(p) > 3])
+        Tags are deduplicated in order of appearance (dict insertion
+        order) and collection stops as soon as five unique tags are
+        found, so the result is deterministic and no throwaway set or
+        intermediate lists are built.
+        """
+        seen: Dict[str, None] = {}
 
-        # Extract from content (simple approach)
-        if content:
-            words = content.split()[:50]  # First 50 words
-            tags.extend(
-                [
-                    w.lower().strip(".,;:")
-                    for w in words
-                    if len(w) > 4 and w[0].isupper()
-                ][:3]
-            )
+        # Extract from the precomputed stem (no Path construction here)
+        for part in stem.split("_"):
+            if len(part) > 3 and part not in seen:
+                seen[part] = None
+                if len(seen) == 5:
+                    return list(seen)
 
-        return list(set(tags))[:5]  # Unique, max 5 tags
+        # Extract from content (simple approach): first 50 words, at most
+        # 3 content-derived tags
+        if content:
+            content_tags = 0
+            for word in content.split()[:50]:
+                if len(word) > 4 and word[0].isupper():
+                    tag = word.lower().translate(_TAG_PUNCT)
+                    if tag not in seen:
+                        seen[tag] = None
+                        content_tags += 1
+                        if len(seen) == 5 or content_tags == 3:
+                            break
+
+        return list(seen)
 
     def _organize_by_category(
         self, files: List[FileMetadata]
@@ -368,21 +908,29 @@ class FileAnalysisService:
 
         for file_metadata in files:
             top_category = file_metadata.suggested_category
-            subcategory = self._detect_subcategory(file_metadata)
+            # Uncategorized files stay flat; probing them for a
+            # subcategory would only spend LLM calls / regex scans on
+            # files we know nothing about.
+            if top_category == "Uncategorized":
+                subcategory = None
+            else:
+                subcategory = self._detect_subcategory(file_metadata)
 
             key = (top_category, subcategory or "")
 
-            if key not in organization:
+            folder_org = organization.get(key)
+            if folder_org is None:
                 # suggested_folder_name contains both levels when subcategory present
                 folder_name = (
                     f"{top_category}/{subcategory}" if subcategory else top_category
                 )
-                organization[key] = FolderOrganization(
+                folder_org = FolderOrganization(
                     category=top_category,
                     suggested_folder_name=sanitize_folder_name(folder_name),
                 )
+                organization[key] = folder_org
 
-            organization[key].files.append(file_metadata)
+            folder_org.files.append(file_metadata)
 
         # Return FolderOrganization objects sorted by file count
         return sorted(
@@ -392,35 +940,19 @@ class FileAnalysisService:
     def _detect_subcategory(self, file_metadata: FileMetadata) -> Optional[str]:
         """Detect a more specific subcategory for files.
 
-        Tries external LLM/OpenAI first, then interactive prompt if INTERACTIVE_MODE=true.
-        Returns None if AI unavailable and not in interactive mode.
+        Reuses the per-file LLM classification, then falls back to the
+        interactive prompt if INTERACTIVE_MODE=true, then to heuristics.
         """
         ext = (file_metadata.file_type or "").lower()
         name = file_metadata.original_name.lower()
         content = (file_metadata.content_preview or "").lower()
 
-        # If external LLM or OpenAI is configured, ask it for subcategory
-        try:
-            external_url = os.environ.get("EXTERNAL_LLM_URL")
-            external_key = os.environ.get("EXTERNAL_LLM_API_KEY")
-            if external_url:
-                result = self._external_llm_classify(
-                    external_url, external_key, file_metadata.original_name, ext, content
-                )
-                if result:
-                    cat, conf, subcat, _ = result
-                    if subcat:
-                        return subcat
-
-            openai_key = os.environ.get("OPENAI_API_KEY")
-            if openai_key:
-                result = self._openai_classify(openai_key, file_metadata.original_name, ext, content)
-                if result:
-                    cat, conf, subcat, _ = result
-                    if subcat:
-                        return subcat
-        except Exception:
-            pass
+        # The cached per-file LLM answer already includes the subcategory
+        result = self._llm_classify_once(
+            file_metadata.original_name, ext, file_metadata.content_preview or ""
+        )
+        if result and result[2]:  # result[2] is subcategory
+            return result[2]
 
         # Fallback to interactive prompt only if explicitly enabled
         if os.environ.get("INTERACTIVE_MODE", "").lower() == "true":
@@ -432,7 +964,16 @@ class FileAnalysisService:
             except Exception:
                 pass
 
-        # No AI and not in interactive mode: return None
+        # Heuristic fallback: extension lookup first, then one combined
+        # regex pass over filename and content
+        subcategory = _EXT_TO_SUBCATEGORY.get(ext)
+        if subcategory:
+            return subcategory
+
+        match = _SUBCATEGORY_RE.search(f"{name} {content}")
+        if match:
+            return match.lastgroup
+
         return None
 
     def _build_structure(self, organized_folders: List[FolderOrganization]) -> dict:
@@ -1,10 +1,16 @@
 """File organization service."""
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
 
-from models import OrganizationResult
-from utils import sanitize_folder_name, FileAccessError, OrganizationError
+from models import FileMetadata, OrganizationResult
+from utils import FileAccessError, OrganizationError
+
+# Moves are latency-bound (one rename or copy+unlink each, worse on
+# networked filesystems), so a bounded pool overlaps them well.
+_MAX_MOVE_WORKERS = 20
 
 
 class FileOrganizationService:
@@ -35,6 +41,10 @@ class FileOrganizationService:
         try:
             results = {"created_folders": [], "moved_files": [], "errors": []}
 
+            # Folder creation stays sequential (a handful of mkdirs);
+            # the per-file moves are collected and run concurrently.
+            move_tasks: list[tuple[FileMetadata, Path]] = []
+
             for folder_org in organization_result.organized_folders:
                 folder_name = folder_org.suggested_folder_name
                 folder_path = source_folder / folder_name
@@ -50,41 +60,80 @@ class FileOrganizationService:
                         continue
 
                 if move_files and create_folders:
-                    for file_metadata in folder_org.files:
-                        try:
-                            self._move_file(
-                                file_metadata.file_path, folder_path, file_metadata.suggested_name
-                            )
-                            results["moved_files"].append(
-                                {
-                                    "from": str(file_metadata.file_path),
-                                    "to": str(
-                                        folder_path / file_metadata.suggested_name
-                                    ),
-                                }
-                            )
-                        except Exception as e:
-                            results["errors"].append(
-                                f"Failed to move {file_metadata.original_name}: {str(e)}"
-                            )
+                    move_tasks.extend(
+                        (file_metadata, folder_path)
+                        for file_metadata in folder_org.files
+                    )
+
+            if move_tasks:
+                self._move_files_parallel(move_tasks, results)
 
             return results
 
         except Exception as e:
             raise OrganizationError(f"Failed to organize files: {str(e)}")
 
-    def _move_file(self, source: Path, dest_folder: Path, new_name: str) -> None:
-        """Move file to destination folder with new name."""
-        dest_path = dest_folder / new_name
-
-        # If destination already exists, append number
-        if dest_path.exists():
-            stem = Path(new_name).stem
-            suffix = Path(new_name).suffix
-            counter = 1
-            while dest_path.exists():
-                new_name = f"{stem}_{counter}{suffix}"
-                dest_path = dest_folder / new_name
-                counter += 1
-
-        shutil.move(str(source), str(dest_path))
+    def _move_files_parallel(
+        self, move_tasks: list[tuple[FileMetadata, Path]], results: dict
+    ) -> None:
+        """Run the collected move tasks on a bounded thread pool."""
+        results_lock = threading.Lock()
+
+        # List each destination folder once up front; collision probing
+        # then happens in memory against these sets instead of issuing
+        # an exists() syscall per candidate name. The lock also makes
+        # name reservation race-free across the move workers.
+        names_lock = threading.Lock()
+        existing_names: dict[Path, set] = {}
+        for _, folder_path in move_tasks:
+            if folder_path not in existing_names:
+                try:
+                    existing_names[folder_path] = set(os.listdir(folder_path))
+                except OSError:
+                    existing_names[folder_path] = set()
+
+        def _do_move(task: tuple[FileMetadata, Path]) -> None:
+            file_metadata, folder_path = task
+            try:
+                with names_lock:
+                    final_name = self._next_free_name(
+                        file_metadata.suggested_name, existing_names[folder_path]
+                    )
+                shutil.move(
+                    str(file_metadata.file_path), str(folder_path / final_name)
+                )
+                with results_lock:
+                    results["moved_files"].append(
+                        {
+                            "from": str(file_metadata.file_path),
+                            "to": str(folder_path / final_name),
+                        }
+                    )
+            except Exception as e:
+                with results_lock:
+                    results["errors"].append(
+                        f"Failed to move {file_metadata.original_name}: {str(e)}"
+                    )
+
+        with ThreadPoolExecutor(
+            max_workers=min(_MAX_MOVE_WORKERS, len(move_tasks))
+        ) as executor:
+            # Consume the iterator so all moves finish before returning
+            list(executor.map(_do_move, move_tasks))
+
+    @staticmethod
+    def _next_free_name(new_name: str, existing: set) -> str:
+        """Reserve a collision-free name against a pre-listed folder."""
+        if new_name not in existing:
+            existing.add(new_name)
+            return new_name
+
+        stem = Path(new_name).stem
+        suffix = Path(new_name).suffix
+        counter = 1
+        candidate = f"{stem}_{counter}{suffix}"
+        while candidate in existing:
+            counter += 1
+            candidate = f"{stem}_{counter}{suffix}"
+        existing.add(candidate)
+        return candidate
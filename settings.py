@@ -31,6 +31,10 @@ MAX_FILE_SIZE_MB = 10
 # Maximum number of files to analyze per folder
 MAX_FILES_TO_ANALYZE = 1000
 
+# Worker threads used to analyze files concurrently. Lower this (e.g. to 4)
+# on spinning disks or when an LLM provider rate-limits aggressively.
+MAX_ANALYSIS_WORKERS = int(os.environ.get("MAX_ANALYSIS_WORKERS", "32"))
+
 # File extensions to consider as text
 TEXT_FILE_EXTENSIONS = {
     ".txt",
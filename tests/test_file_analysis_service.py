@@ -12,9 +12,13 @@ def analysis_service():
     return FileAnalysisService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def temp_folder():
-    """Create temporary folder with test files."""
+    """Create temporary folder with test files (seeded once per session).
+
+    The analysis tests only read from this folder, so it is safe to
+    share across tests.
+    """
     with tempfile.TemporaryDirectory() as tmpdir:
         base_path = Path(tmpdir)
 
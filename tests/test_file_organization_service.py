@@ -1,4 +1,5 @@
 """Tests for file organization service."""
+import shutil
 import tempfile
 from pathlib import Path
 import pytest
@@ -18,9 +19,13 @@ def organization_service():
     return FileOrganizationService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def temp_folder_with_files():
-    """Create temporary folder with test files."""
+    """Create temporary folder with test files (seeded once per session).
+
+    Tests must leave the seeded files untouched; anything they create
+    inside the folder should be cleaned up before returning.
+    """
     with tempfile.TemporaryDirectory() as tmpdir:
         base_path = Path(tmpdir)
 
@@ -58,9 +63,14 @@ def test_create_folders(analysis_service, organization_service, temp_folder_with
         analysis_result, create_folders=True, move_files=False
     )
 
-    # Check that folders were created
-    assert len(org_result.get("created_folders", [])) > 0
-
-    # Verify folders exist
-    for folder in org_result.get("created_folders", []):
-        assert Path(folder).exists()
+    try:
+        # Check that folders were created
+        assert len(org_result.get("created_folders", [])) > 0
+
+        # Verify folders exist
+        for folder in org_result.get("created_folders", []):
+            assert Path(folder).exists()
+    finally:
+        # Leave the session-scoped fixture folder as it was seeded
+        for folder in org_result.get("created_folders", []):
+            shutil.rmtree(folder, ignore_errors=True)
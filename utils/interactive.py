@@ -1,5 +1,6 @@
 """Interactive prompts for manual classification via MCP Inspector or CLI."""
 import json
+import sys
 from typing import Optional, Tuple
 
 
@@ -9,7 +10,26 @@ def prompt_for_classification(
     """Interactively prompt user for file classification.
 
     Returns (category, confidence, subcategory, suggested_name) or None if user skips.
+
+    On a real TTY this walks the user through one question per field.
+    When stdin is a pipe (MCP Inspector or a scripted driver), that
+    would cost four blocking line reads and four flushes per file, so
+    the exchange collapses to one JSON line out and one JSON line back.
     """
+    if not sys.stdin.isatty():
+        print(
+            json.dumps(
+                {
+                    "classify": filename,
+                    "file_type": file_type,
+                    "preview": content_preview[:200],
+                },
+                separators=(",", ":"),
+            ),
+            flush=True,
+        )
+        return _read_classification_line()
+
     print(f"\n{'='*70}")
     print(f"Classify file: {filename}")
     print(f"Extension: {file_type}")
@@ -42,6 +62,29 @@ def prompt_for_classification(
     return category, confidence, subcategory, suggested_name
 
 
+def _read_classification_line() -> Optional[Tuple[str, float, Optional[str], Optional[str]]]:
+    """Parse one JSON answer line from a piped stdin, or None to skip.
+
+    Expected shape: {"category": ..., "confidence": ..., "subcategory": ...,
+    "suggested_name": ...}; only category is required.
+    """
+    line = sys.stdin.readline()
+    if not line:
+        return None
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    category = (data.get("category") or "").strip()
+    if not category:
+        return None
+    try:
+        confidence = float(data.get("confidence", 0.8))
+    except (TypeError, ValueError):
+        confidence = 0.8
+    return category, confidence, data.get("subcategory") or None, data.get("suggested_name") or None
+
+
 def prompt_for_filename(original_name: str) -> Optional[str]:
     """Interactively prompt user for a new filename.
 
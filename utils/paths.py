@@ -1,8 +1,17 @@
 """Path utilities and validation."""
+import os
+import stat
 from pathlib import Path
-from typing import Optional
+
+from settings import TEXT_FILE_EXTENSIONS
+
 from .errors import InvalidPathError
 
+# Frozen once at import: membership is a single C-level hash lookup and
+# the extension list stays in sync with settings instead of a private
+# copy rebuilt on every call.
+_TEXT_EXTENSIONS = frozenset(TEXT_FILE_EXTENSIONS)
+
 
 def validate_path(path: str) -> Path:
     """
@@ -17,41 +26,52 @@ def validate_path(path: str) -> Path:
     Raises:
         InvalidPathError: If path is invalid or not accessible
     """
+    # One os.stat answers both "does it exist" and "is it a directory";
+    # exists() + is_dir() would stat the same path twice.
     try:
-        p = Path(path)
-        if not p.exists():
-            raise InvalidPathError(f"Path does not exist: {path}")
-        if not p.is_dir():
-            raise InvalidPathError(f"Path is not a directory: {path}")
-        return p
+        st = os.stat(path)
+    except FileNotFoundError:
+        # `from None`: a missing path is an expected input error, not a
+        # bug — suppress chaining so no OSError context is dragged along.
+        raise InvalidPathError(f"Path does not exist: {path}") from None
     except (OSError, ValueError) as e:
-        raise InvalidPathError(f"Invalid path '{path}': {str(e)}")
+        raise InvalidPathError(f"Invalid path '{path}': {str(e)}") from None
+    if not stat.S_ISDIR(st.st_mode):
+        raise InvalidPathError(f"Path is not a directory: {path}")
+    return Path(path)
 
 
 def get_relative_path(file_path: Path, base_path: Path) -> str:
     """Get relative path from base directory."""
+    fp = os.fspath(file_path)
+    bp = os.fspath(base_path)
+    # Fast path for the common direct-descendant case: plain string
+    # slicing, no Path parsing and no ValueError used as control flow.
+    if fp.startswith(bp) and fp[len(bp) : len(bp) + 1] == os.sep:
+        return fp[len(bp) + 1 :]
     try:
-        return str(file_path.relative_to(base_path))
+        return str(Path(fp).relative_to(bp))
     except ValueError:
-        return str(file_path)
+        return fp
 
 
-def is_text_file(file_path: Path, max_size_mb: int = 10) -> bool:
-    """Check if file is readable text."""
-    text_extensions = {
-        '.txt', '.md', '.py', '.js', '.ts', '.json', '.yaml', '.yml',
-        '.xml', '.html', '.css', '.sql', '.java', '.cpp', '.c', '.h',
-        '.sh', '.bash', '.log', '.csv', '.ini', '.conf', '.config'
-    }
-    
-    if file_path.suffix.lower() not in text_extensions:
+def is_text_file(
+    file_path: Path,
+    max_size_mb: int = 10,
+    stat_result: os.stat_result | None = None,
+) -> bool:
+    """Check if file is readable text.
+
+    Callers that already hold a stat result (e.g. from an os.scandir
+    DirEntry) can pass it to skip the extra stat() syscall per file.
+    """
+    # Extension gate first: rejects most non-text files with zero syscalls
+    if file_path.suffix.lower() not in _TEXT_EXTENSIONS:
         return False
-    
-    # Check file size
-    try:
-        if file_path.stat().st_size > max_size_mb * 1024 * 1024:
+
+    if stat_result is None:
+        try:
+            stat_result = file_path.stat()
+        except OSError:
             return False
-    except (OSError, ValueError):
-        return False
-    
-    return True
+    return stat_result.st_size <= max_size_mb * 1024 * 1024